@@ -2,10 +2,15 @@ from typing import Optional
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from firebase_admin import auth
+import time
 from .models import User
+from .cache import get_cache, token_key
 
 security = HTTPBearer()
 
+# Upper bound on how long a verified token is trusted without re-checking
+TOKEN_CACHE_TTL = 300
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> User:
     """
     Get the current user from the Firebase ID token
@@ -13,19 +18,29 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
     try:
         # Verify the Firebase ID token
         token = credentials.credentials
+        cache = get_cache()
+        cached_user = await cache.aget(token_key(token))
+        if cached_user:
+            return User(**cached_user)
+
         decoded_token = auth.verify_id_token(token)
         
         # Get the user from Firebase
         firebase_user = auth.get_user(decoded_token['uid'])
         
         # Convert to our User model
-        return User(
+        user = User(
             id=firebase_user.uid,
             email=firebase_user.email or "",
             name=firebase_user.display_name or "",
             photo_url=firebase_user.photo_url,
             email_verified=firebase_user.email_verified
         )
+
+        # Share the verification with other workers, never past token expiry
+        ttl = min(TOKEN_CACHE_TTL, decoded_token['exp'] - time.time())
+        await cache.aset(token_key(token), user.model_dump(), ttl)
+        return user
         
     except Exception as e:
         raise HTTPException(
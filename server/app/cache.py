@@ -0,0 +1,134 @@
+"""
+Cross-process cache backed by a local SQLite file.
+
+Every uvicorn worker opens the same file, so a token verification, resume
+manifest or analysis result cached by one worker is a hit in all others.
+Values are stored as JSON with an absolute expiry time. Request handlers
+use the async methods, which run the SQLite calls in a worker thread so
+they never block the event loop. The busy timeout is kept short. A lock
+held by another worker, an unusable CACHE_PATH, or any other SQLite or
+filesystem error is logged and treated as a miss, so the cache never fails
+a request. Expired rows are purged by a periodic task started in the
+lifespan hook.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+import hashlib
+import json
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from .config import get_settings
+
+# Seconds to wait for another worker's write lock before giving up
+BUSY_TIMEOUT = 0.05
+# Seconds between purges of expired rows
+PURGE_INTERVAL = 10 * 60
+
+class SharedCache:
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            # WAL lets readers in other workers proceed while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            self._conn = conn
+        return self._conn
+
+    def reset_after_fork(self) -> None:
+        """Drop the parent's connection; the child opens its own on first use"""
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Cache read error for {key}: {str(e)}")
+            return None
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + ttl)
+                )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Cache write error for {key}: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            with self._lock:
+                self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError) as e:
+            print(f"Cache delete error for {key}: {str(e)}")
+
+    def purge_expired(self) -> None:
+        try:
+            with self._lock:
+                self._connection().execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+        except (sqlite3.Error, OSError) as e:
+            print(f"Cache purge error: {str(e)}")
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: float) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def adelete(self, key: str) -> None:
+        await asyncio.to_thread(self.delete, key)
+
+    async def purge_periodically(self, interval: float = PURGE_INTERVAL) -> None:
+        """Delete expired rows every interval seconds, until cancelled"""
+        while True:
+            await asyncio.to_thread(self.purge_expired)
+            await asyncio.sleep(interval)
+
+def token_key(token: str) -> str:
+    return f"token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+def resumes_key(user_id: str) -> str:
+    return f"resumes:{user_id}"
+
+def suggestions_key(user_id: str, resume_id: str) -> str:
+    return f"suggestions:{user_id}/{resume_id}"
+
+def section_key(suggestions_path: str, section_id: str, format: str) -> str:
+    return f"section:{suggestions_path}#{section_id}.{format}"
+
+@lru_cache
+def get_cache() -> SharedCache:
+    """Get the SharedCache singleton for this process"""
+    return SharedCache(get_settings().cache_path)
+
+# Only runs under servers that fork after importing the app, such as
+# gunicorn --preload; serve.py's uvicorn workers are spawned and import fresh
+def _reset_after_fork() -> None:
+    if get_cache.cache_info().currsize:
+        get_cache().reset_after_fork()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,30 +1,14 @@
+"""Application settings module"""
+from functools import lru_cache
 from pathlib import Path
 import os
-from dotenv import load_dotenv
-from firebase_admin import credentials, initialize_app
-from .env import PROJECT_ROOT, ENVIRONMENT, IS_DEVELOPMENT
+from typing import Optional
+from pydantic import BaseModel
+from .env import PROJECT_ROOT, load_env
 
-# Load environment variables from project root
-PROJECT_ROOT = Path(__file__).parent.parent.parent.resolve()
-
-# Print current working directory and .env file path for debugging
-print(f"Current working directory: {os.getcwd()}")
-print(f"Looking for .env file at: {PROJECT_ROOT / '.env'}")
-print(f".env file exists: {(PROJECT_ROOT / '.env').exists()}")
-
-# Load environment variables in order of precedence
-load_dotenv(PROJECT_ROOT / ".env")
-load_dotenv(PROJECT_ROOT / f".env.{os.getenv('ENVIRONMENT', 'development')}")
-load_dotenv(PROJECT_ROOT / ".env.local")  # Local overrides
-
-# API Configuration
-PROJECT_NAME = "AIResumeBooster API"
+# API configuration
 API_PREFIX = "/api"
-
-# Environment
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-IS_DEVELOPMENT = ENVIRONMENT == "development"
-IS_PRODUCTION = ENVIRONMENT == "production"
+PROJECT_NAME = "AIResumeBooster"
 
 # Required environment variables
 REQUIRED_ENV_VARS = [
@@ -33,51 +17,94 @@ REQUIRED_ENV_VARS = [
     "FIREBASE_CLIENT_EMAIL",
     "FIREBASE_CLIENT_ID",
     "FIREBASE_CLIENT_CERT_URL",
-    "OPENAI_API_KEY"  # Add OpenAI API key to required variables
+    "OPENAI_API_KEY"
 ]
 
-# Print all environment variables for debugging
-print("Environment variables:")
-for var in REQUIRED_ENV_VARS:
-    print(f"{var}: {'✓' if os.getenv(var) else '✗'}")
+# Firebase defaults
+DEFAULT_FIREBASE_PROJECT_ID = "airesumebooster"
+DEFAULT_STORAGE_BUCKET = "airesumebooster.firebasestorage.app"
 
-# Validate required environment variables
-missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
-if missing_vars:
-    raise RuntimeError(f"Missing required environment variables: {', '.join(missing_vars)}")
+class Settings(BaseModel):
+    """Typed application settings, read from the environment once"""
+    project_root: Path
+    environment: str
+    firebase_project_id: str
+    firebase_private_key_id: str
+    firebase_private_key: str
+    firebase_client_email: str
+    firebase_client_id: str
+    firebase_client_cert_url: str
+    storage_bucket: str
+    openai_api_key: str
+    # Diagnostics: event-loop watchdog and on-demand request profiling
+    loop_block_threshold_ms: float
+    profile_token: Optional[str]
+    profile_sample_rate: float
+    profile_dir: Path
+    # Deployment: worker processes and the cache they share
+    web_concurrency: Optional[int]
+    shutdown_timeout: float
+    cache_path: Path
 
-# Firebase configuration
-STORAGE_BUCKET = "airesumebooster.firebasestorage.app"
+    class Config:
+        frozen = True
 
-firebase_config = {
-    "type": "service_account",
-    "project_id": os.getenv("VITE_FIREBASE_PROJECT_ID"),
-    "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
-    "private_key": os.getenv("FIREBASE_PRIVATE_KEY", "").replace("\\n", "\n"),
-    "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
-    "client_id": os.getenv("FIREBASE_CLIENT_ID"),
-    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-    "token_uri": "https://oauth2.googleapis.com/token",
-    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-    "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
-}
+    @property
+    def is_development(self) -> bool:
+        return self.environment == "development"
 
-# Initialize Firebase Admin
-try:
-    cred = credentials.Certificate(firebase_config)
-    firebase_app = initialize_app(cred, {
-        'storageBucket': STORAGE_BUCKET
-    })
-except Exception as e:
-    print(f"Error initializing Firebase: {e}")
-    # For development, you might want to initialize without credentials
-    if IS_DEVELOPMENT:
-        firebase_app = initialize_app(options={
-            'storageBucket': STORAGE_BUCKET
-        })
-    else:
-        raise
+    @property
+    def is_production(self) -> bool:
+        return self.environment == "production"
 
-# API configuration
-API_PREFIX = "/api"
-PROJECT_NAME = "AIResumeBooster" 
\ No newline at end of file
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Load .env files and build settings from the process environment.
+        Raises RuntimeError if any required variable is missing.
+        """
+        load_env()
+
+        missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+        if missing_vars:
+            raise RuntimeError(f"Missing required environment variables: {', '.join(missing_vars)}")
+
+        return cls(
+            project_root=PROJECT_ROOT,
+            environment=os.getenv("ENVIRONMENT", "development"),
+            firebase_project_id=os.getenv("VITE_FIREBASE_PROJECT_ID") or DEFAULT_FIREBASE_PROJECT_ID,
+            firebase_private_key_id=os.environ["FIREBASE_PRIVATE_KEY_ID"],
+            firebase_private_key=os.environ["FIREBASE_PRIVATE_KEY"].replace("\\n", "\n"),
+            firebase_client_email=os.environ["FIREBASE_CLIENT_EMAIL"],
+            firebase_client_id=os.environ["FIREBASE_CLIENT_ID"],
+            firebase_client_cert_url=os.environ["FIREBASE_CLIENT_CERT_URL"],
+            storage_bucket=os.getenv("FIREBASE_STORAGE_BUCKET") or DEFAULT_STORAGE_BUCKET,
+            openai_api_key=os.environ["OPENAI_API_KEY"],
+            loop_block_threshold_ms=float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100")),
+            profile_token=os.getenv("PROFILE_TOKEN") or None,
+            profile_sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            profile_dir=Path(os.getenv("PROFILE_DIR") or PROJECT_ROOT / "profiles"),
+            web_concurrency=int(os.getenv("WEB_CONCURRENCY")) if os.getenv("WEB_CONCURRENCY") else None,
+            shutdown_timeout=float(os.getenv("SHUTDOWN_TIMEOUT", "120")),
+            cache_path=Path(os.getenv("CACHE_PATH") or PROJECT_ROOT / ".cache" / "shared_cache.sqlite3"),
+        )
+
+    def firebase_credentials(self) -> dict:
+        """Service account info for firebase_admin.credentials.Certificate"""
+        return {
+            "type": "service_account",
+            "project_id": self.firebase_project_id,
+            "private_key_id": self.firebase_private_key_id,
+            "private_key": self.firebase_private_key,
+            "client_email": self.firebase_client_email,
+            "client_id": self.firebase_client_id,
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+            "client_x509_cert_url": self.firebase_client_cert_url,
+        }
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get the Settings singleton, loading the environment on first use"""
+    return Settings.from_env()
@@ -0,0 +1,167 @@
+"""
+Runtime diagnostics: event-loop blocking detection and request profiling.
+
+LoopWatchdog reports the stack of any callback that keeps the event loop
+busy longer than a threshold. ProfilingMiddleware samples the event-loop
+thread while a request is in flight and writes the samples in folded-stack
+format, which flamegraph.pl and speedscope read directly.
+"""
+import asyncio
+import hmac
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+from .config import get_settings
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_PATH_HEADER = "X-Profile-Path"
+
+class LoopWatchdog:
+    """Measures event-loop lag and logs the stack of blocking callbacks"""
+
+    def __init__(self, threshold: float, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the running event loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread:
+            await asyncio.to_thread(self._thread.join)
+
+    async def _beat(self) -> None:
+        # Any delay beyond the requested sleep is time the loop spent elsewhere
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.lag = max(0.0, now - expected)
+            self.max_lag = max(self.max_lag, self.lag)
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < self.threshold or heartbeat == reported:
+                continue
+            # Report each stall once, with the stack of whatever is running now
+            reported = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>\n"
+            print(f"Event loop blocked for at least {blocked * 1000:.0f}ms:\n{stack}", end="")
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval into folded stacks"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Samples in folded-stack format, one 'frame;frame;... count' per line"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that carry a valid X-Profile-Token
+    header, plus a random PROFILE_SAMPLE_RATE fraction of all requests.
+    Other requests pass straight through. The event-loop thread is sampled,
+    so concurrent requests show up in the profile too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = scope["path"].strip("/").replace("/", "_") or "root"
+        path = settings.profile_dir / f"{timestamp}-{scope['method']}-{name}.folded"
+
+        async def send_with_profile_path(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_PATH_HEADER.lower().encode(), path.name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_path)
+        finally:
+            # Joining the sampler thread must not block the loop
+            await asyncio.to_thread(sampler.stop)
+            try:
+                await asyncio.to_thread(_write_profile, path, sampler.folded())
+                print(f"Saved request profile to {path}")
+            except Exception as e:
+                print(f"Error saving request profile: {str(e)}")
+
+def _should_profile(scope) -> bool:
+    settings = get_settings()
+    if settings.profile_token:
+        expected = settings.profile_token.encode()
+        header = PROFILE_HEADER.lower().encode()
+        for key, value in scope.get("headers", []):
+            if key == header and hmac.compare_digest(value, expected):
+                return True
+    return random.random() < settings.profile_sample_rate
+
+def _write_profile(path, folded: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(folded)
@@ -1,39 +1,35 @@
+import os
 import firebase_admin
 from firebase_admin import credentials
-import json
-import os
+from .config import get_settings
 
-def initialize_firebase():
-    """Initialize Firebase Admin SDK"""
+# PID of the process that created the default app
+_initialized_pid = None
+
+def initialize_firebase() -> firebase_admin.App:
+    """
+    Initialize Firebase Admin SDK once per process and return the default app.
+    An app inherited through fork shares the parent's HTTP connection pools,
+    so a forked worker replaces it with its own.
+    """
+    global _initialized_pid
     try:
-        # Check if default app already exists
-        default_app = None
-        try:
-            default_app = firebase_admin.get_app()
-        except ValueError:
-            pass
+        app = firebase_admin.get_app()
+        if _initialized_pid == os.getpid():
+            return app
+        firebase_admin.delete_app(app)
+    except ValueError:
+        pass
+    _initialized_pid = os.getpid()
 
-        if not default_app:
-            # Get credentials from environment variables
-            cred_dict = {
-                "type": "service_account",
-                "project_id": "airesumebooster",
-                "private_key_id": os.environ["FIREBASE_PRIVATE_KEY_ID"],
-                "private_key": os.environ["FIREBASE_PRIVATE_KEY"].replace("\\n", "\n"),
-                "client_email": os.environ["FIREBASE_CLIENT_EMAIL"],
-                "client_id": os.environ["FIREBASE_CLIENT_ID"],
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                "client_x509_cert_url": os.environ["FIREBASE_CLIENT_CERT_URL"]
-            }
-            
-            cred = credentials.Certificate(cred_dict)
-            firebase_admin.initialize_app(cred, {
-                'storageBucket': f"{os.getenv('VITE_FIREBASE_PROJECT_ID')}.appspot.com"
-            })
-            print("Firebase Admin SDK initialized successfully")
-        else:
-            print("Firebase Admin SDK already initialized")
+    settings = get_settings()
+    options = {'storageBucket': settings.storage_bucket}
+    try:
+        cred = credentials.Certificate(settings.firebase_credentials())
+        return firebase_admin.initialize_app(cred, options)
     except Exception as e:
-        print(f"Failed to initialize Firebase: {e}") 
\ No newline at end of file
+        print(f"Error initializing Firebase: {e}")
+        # For development, fall back to application default credentials
+        if settings.is_development:
+            return firebase_admin.initialize_app(options=options)
+        raise
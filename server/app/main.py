@@ -2,40 +2,57 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-import os
-from pathlib import Path
-
-# Load environment variables first
-from .env import PROJECT_ROOT, ENVIRONMENT, IS_DEVELOPMENT
+from contextlib import asynccontextmanager
+import asyncio
 
 from .routes import auth_router, resumes_router
-from .config import API_PREFIX, PROJECT_NAME
+from .config import API_PREFIX, PROJECT_NAME, get_settings
 from .firebase import initialize_firebase
 from .storage import get_storage
+from .openai_client import init_openai, close_openai
+from .diagnostics import LoopWatchdog, ProfilingMiddleware
+from .cache import get_cache
 
-# Initialize Firebase Admin SDK
-initialize_firebase()
+# Load settings once; clients are created per worker in the lifespan hook
+settings = get_settings()
 
-# Initialize Firebase Storage (this will create the singleton instance)
-storage = get_storage()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize Firebase, storage and OpenAI clients before serving requests"""
+    initialize_firebase()
+    get_storage()
+    init_openai()
+    purge_task = asyncio.create_task(get_cache().purge_periodically())
+    watchdog = LoopWatchdog(threshold=settings.loop_block_threshold_ms / 1000)
+    watchdog.start()
+    app.state.loop_watchdog = watchdog
+    yield
+    purge_task.cancel()
+    await watchdog.stop()
+    await close_openai()
 
 app = FastAPI(
     title=PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{API_PREFIX}/openapi.json",
     docs_url=f"{API_PREFIX}/docs",
     redoc_url=f"{API_PREFIX}/redoc",
 )
 
 # Configure CORS based on environment
-origins = ["http://localhost:5000"] if IS_DEVELOPMENT else ["*"]
+origins = ["http://localhost:5000"] if settings.is_development else ["*"]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Path"],
 )
 
+# Sample a stack profile of requests that ask for it (see diagnostics.py)
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(
     auth_router,
@@ -51,7 +68,13 @@ app.include_router(
 
 @app.get("/healthcheck")
 async def root():
-    return {"status": "healthy", "environment": ENVIRONMENT}
+    watchdog = app.state.loop_watchdog
+    return {
+        "status": "healthy",
+        "environment": settings.environment,
+        "loop_lag_ms": round(watchdog.lag * 1000, 1),
+        "max_loop_lag_ms": round(watchdog.max_lag * 1000, 1),
+    }
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -61,8 +84,8 @@ async def http_exception_handler(request, exc):
     )
 
 # In production, serve static files
-if IS_DEVELOPMENT:
-    static_dir = PROJECT_ROOT / "dist" / "public"
+if settings.is_development:
+    static_dir = settings.project_root / "dist" / "public"
     if not static_dir.exists():
         raise RuntimeError(f"Static directory '{static_dir}' does not exist. Please run 'npm run build' first.")
     app.mount("/", StaticFiles(directory=str(static_dir), html=True), name="static") 
\ No newline at end of file
@@ -1,7 +1,18 @@
 """Models package"""
 
 from .user import User
-from .resume import Resume, ResumeBase, ResumeCreate, SuggestionResponse
+from .resume import (
+    Resume,
+    ResumeBase,
+    ResumeCreate,
+    SuggestionResponse,
+    SuggestionItem,
+    SuggestionSection,
+    StructuredSuggestions,
+    SectionSummary,
+    SuggestionSummaryResponse,
+    SuggestionSectionResponse,
+)
 
 __all__ = [
     'User',
@@ -9,4 +20,10 @@ __all__ = [
     'ResumeBase',
     'ResumeCreate',
     'SuggestionResponse',
+    'SuggestionItem',
+    'SuggestionSection',
+    'StructuredSuggestions',
+    'SectionSummary',
+    'SuggestionSummaryResponse',
+    'SuggestionSectionResponse',
 ]
@@ -1,7 +1,7 @@
 """Resume models module"""
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ResumeBase(BaseModel):
     userId: str = Field(alias="user_id")
@@ -32,4 +32,57 @@ class SuggestionResponse(BaseModel):
 
     class Config:
         populate_by_name = True
-        json_encoders = {datetime: lambda v: v.isoformat()} 
\ No newline at end of file
+        json_encoders = {datetime: lambda v: v.isoformat()} 
+
+class SuggestionItem(BaseModel):
+    id: str
+    text: str
+
+class SuggestionSection(BaseModel):
+    id: str
+    title: str
+    score: Optional[int] = Field(None, ge=0, le=10)
+    items: List[SuggestionItem] = []
+
+class StructuredSuggestions(BaseModel):
+    overallScore: Optional[int] = Field(None, alias="overall_score", ge=0, le=10)
+    summary: str = ""
+    sections: List[SuggestionSection] = []
+
+    class Config:
+        populate_by_name = True
+
+class SectionSummary(BaseModel):
+    id: str
+    title: str
+    score: Optional[int] = None
+    itemCount: int = Field(alias="item_count")
+
+    class Config:
+        populate_by_name = True
+
+class SuggestionSummaryResponse(BaseModel):
+    resumeId: str = Field(alias="resume_id")
+    overallScore: Optional[int] = Field(None, alias="overall_score")
+    summary: str
+    sections: List[SectionSummary]
+    createdAt: datetime = Field(alias="created_at")
+
+    class Config:
+        populate_by_name = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+class SuggestionSectionResponse(BaseModel):
+    resumeId: str = Field(alias="resume_id")
+    id: str
+    title: str
+    score: Optional[int] = None
+    format: str
+    # Structured items for format=json, pre-rendered content otherwise
+    items: Optional[List[SuggestionItem]] = None
+    content: Optional[str] = None
+    createdAt: datetime = Field(alias="created_at")
+
+    class Config:
+        populate_by_name = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
@@ -1,43 +1,77 @@
 """OpenAI client for resume analysis"""
-import os
-from typing import Optional
-from openai import AsyncOpenAI, APIError
-import PyPDF2
+from typing import Optional, TYPE_CHECKING
 import io
+import os
+from .config import get_settings
+from .models import StructuredSuggestions
+from .suggestions import parse_analysis
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types import CompletionUsage
 
-client: Optional[AsyncOpenAI] = None
+# Bump whenever the analysis prompt or model changes, so stored suggestions
+# can be told apart and refreshed with `python -m server.app.reanalyze`
+PROMPT_VERSION = "2"
+
+# openai and PyPDF2 are imported on first use to keep application import fast
+client: Optional["AsyncOpenAI"] = None
 
 def init_openai():
     """Initialize OpenAI client with API key"""
     global client
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable not set")
-    client = AsyncOpenAI(api_key=api_key)
+    if client is not None:
+        return
+    from openai import AsyncOpenAI
+    client = AsyncOpenAI(api_key=get_settings().openai_api_key)
+
+def _reset_after_fork():
+    # The client's connection pool belongs to the parent process
+    global client
+    client = None
+
+# Only runs under servers that fork after importing the app, such as
+# gunicorn --preload; serve.py's uvicorn workers are spawned and import fresh
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+async def close_openai():
+    """Close the OpenAI client and its connection pool"""
+    global client
+    if client is not None:
+        await client.close()
+        client = None
 
-async def analyze_resume(pdf_content: bytes) -> str:
+def extract_text(pdf_content: bytes) -> str:
+    """Extract plain text from all pages of a PDF"""
+    import PyPDF2
+
+    pdf_file = io.BytesIO(pdf_content)
+    reader = PyPDF2.PdfReader(pdf_file)
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    return text
+
+async def analyze_text(text: str) -> tuple[StructuredSuggestions, Optional["CompletionUsage"]]:
     """
-    Analyze a resume PDF and return improvement suggestions as markdown.
+    Analyze resume text and return structured suggestions with token usage.
     
     Args:
-        pdf_content: Raw PDF file content
+        text: Text extracted from the resume
         
     Returns:
-        str: Improvement suggestions formatted as markdown
+        tuple: Structured suggestions and the completion token usage
     """
+    from openai import APIError
+
     if not client:
         init_openai()
         
-    # Extract text from PDF
-    pdf_file = io.BytesIO(pdf_content)
-    reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-        
     # Prepare prompt for GPT
-    prompt = f"""Analyze this resume and provide detailed improvement suggestions. Format your response in markdown with clear sections and bullet points.
-Focus on:
+    prompt = f"""Analyze this resume and provide detailed improvement suggestions.
+Respond with JSON only, in this format:
+{{"overall_score": 0-10, "summary": "one paragraph", "sections": [{{"title": "section title", "score": 0-10, "items": ["actionable suggestion", ...]}}]}}
+Use one section per area, covering:
 - Content and clarity
 - Professional impact
 - Skills presentation
@@ -60,11 +94,24 @@ Resume text:
             max_tokens=2000
         )
         
-        return response.choices[0].message.content
+        return parse_analysis(response.choices[0].message.content), response.usage
         
     except APIError as e:
         print(f"OpenAI API error: {str(e)}")
         raise
     except Exception as e:
         print(f"Error analyzing resume: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
+
+async def analyze_resume(pdf_content: bytes) -> StructuredSuggestions:
+    """
+    Analyze a resume PDF and return structured improvement suggestions.
+    
+    Args:
+        pdf_content: Raw PDF file content
+        
+    Returns:
+        StructuredSuggestions: Scored sections of suggestion items
+    """
+    suggestions, _ = await analyze_text(extract_text(pdf_content))
+    return suggestions
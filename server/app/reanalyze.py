@@ -0,0 +1,196 @@
+"""
+Offline bulk re-analysis of stored resumes.
+
+Walks every PDF under resumes/{user}/ in the storage bucket, re-runs the
+analysis with the current prompt and writes a new suggestions version under
+suggestions/{user}/{resume}/. Progress is checkpointed to a local JSON file,
+so an interrupted run picks up where it stopped.
+
+Run from the project root:
+
+    python -m server.app.reanalyze --concurrency 16 --checkpoint reanalyze.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import traceback
+from pathlib import Path
+from typing import Optional
+from .openai_client import PROMPT_VERSION, analyze_text, close_openai, extract_text, init_openai
+from .storage import FirebaseStorage, get_storage
+
+class Checkpoint:
+    """Set of resume blobs already re-analyzed with a given prompt version"""
+
+    def __init__(self, path: Path, prompt_version: str):
+        self.path = path
+        self.prompt_version = prompt_version
+        self.done: set[str] = set()
+        self.failed: dict[str, str] = {}
+        if path.exists():
+            data = json.loads(path.read_text())
+            # A checkpoint from another prompt version does not apply
+            if data.get("prompt_version") == prompt_version:
+                self.done = set(data.get("done", []))
+                self.failed = data.get("failed", {})
+
+    def save(self) -> None:
+        """Write the checkpoint atomically"""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({
+            "prompt_version": self.prompt_version,
+            "done": sorted(self.done),
+            "failed": self.failed,
+        }))
+        os.replace(tmp_path, self.path)
+
+class Report:
+    """Throughput and token usage of a re-analysis run"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def add_usage(self, usage) -> None:
+        if usage is not None:
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+
+    def as_dict(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "prompt_version": PROMPT_VERSION,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 1),
+            "documents_per_minute": round(self.processed / elapsed * 60, 2) if elapsed else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+        }
+
+def parse_resume_blob(blob_name: str) -> Optional[tuple[str, str]]:
+    """Split resumes/{user_id}/{resume_id}.pdf into (user_id, resume_id)"""
+    parts = blob_name.split('/')
+    if len(parts) != 3 or not parts[2].endswith('.pdf'):
+        return None
+    return parts[1], parts[2][:-len('.pdf')]
+
+async def reanalyze_one(storage: FirebaseStorage, blob_name: str, report: Report) -> bool:
+    """
+    Re-analyze one resume unless its latest suggestions already carry the
+    current prompt version. Returns False if it was skipped.
+    """
+    user_id, resume_id = parse_resume_blob(blob_name)
+    # Uploads after the version bump, or a run elsewhere, may have done it already
+    if await storage.get_latest_prompt_version(user_id, resume_id) == PROMPT_VERSION:
+        return False
+    content = await storage.download_pdf(blob_name)
+    text = await asyncio.to_thread(extract_text, content)
+    suggestions, usage = await analyze_text(text)
+    report.add_usage(usage)
+    await storage.upload_suggestions(
+        suggestions, resume_id, user_id,
+        metadata={"prompt_version": PROMPT_VERSION}
+    )
+    return True
+
+async def run(
+    concurrency: int,
+    checkpoint: Checkpoint,
+    user_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    checkpoint_every: int = 20
+) -> Report:
+    """
+    Re-analyze resumes with bounded concurrency.
+    Blob listing is streamed through a bounded queue, so memory stays flat
+    regardless of bucket size.
+    """
+    storage = get_storage()
+    init_openai()
+    report = Report()
+    queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def produce() -> None:
+        blobs = iter(storage.list_resume_blobs(user_id))
+        queued = 0
+        try:
+            while limit is None or queued < limit:
+                # Listing pages are fetched lazily and block, so advance in a thread
+                blob = await asyncio.to_thread(next, blobs, None)
+                if blob is None:
+                    break
+                if parse_resume_blob(blob.name) is None:
+                    continue
+                if blob.name in checkpoint.done:
+                    report.skipped += 1
+                    continue
+                await queue.put(blob.name)
+                queued += 1
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    handled = 0
+
+    async def work() -> None:
+        nonlocal handled
+        while (blob_name := await queue.get()) is not None:
+            try:
+                if await reanalyze_one(storage, blob_name, report):
+                    report.processed += 1
+                else:
+                    report.skipped += 1
+                checkpoint.done.add(blob_name)
+                checkpoint.failed.pop(blob_name, None)
+            except Exception as e:
+                print(f"Error re-analyzing {blob_name}: {str(e)}")
+                print(f"Traceback: {traceback.format_exc()}")
+                checkpoint.failed[blob_name] = str(e)
+                report.failed += 1
+            handled += 1
+            if handled % checkpoint_every == 0:
+                checkpoint.save()
+                print(json.dumps(report.as_dict()))
+
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    finally:
+        checkpoint.save()
+        await close_openai()
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="analyses in flight at once")
+    parser.add_argument("--checkpoint", type=Path, default=Path("reanalyze_checkpoint.json"), help="checkpoint file used to resume")
+    parser.add_argument("--checkpoint-every", type=int, default=20, help="save the checkpoint after this many documents")
+    parser.add_argument("--user", help="only re-analyze resumes of this user id")
+    parser.add_argument("--limit", type=int, help="stop after this many documents")
+    parser.add_argument("--report", type=Path, help="write the throughput report as JSON to this file")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint, PROMPT_VERSION)
+    report = asyncio.run(run(
+        concurrency=args.concurrency,
+        checkpoint=checkpoint,
+        user_id=args.user,
+        limit=args.limit,
+        checkpoint_every=args.checkpoint_every,
+    ))
+
+    summary = json.dumps(report.as_dict(), indent=2)
+    print(summary)
+    if args.report:
+        args.report.write_text(summary + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from firebase_admin import auth
-from typing import List
+from typing import List, Literal, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
-from ..models import Resume, SuggestionResponse, User
+from ..models import (
+    Resume,
+    SuggestionResponse,
+    SuggestionSummaryResponse,
+    SuggestionSectionResponse,
+    SectionSummary,
+    StructuredSuggestions,
+    User,
+)
 from ..storage import FirebaseStorage, get_storage
 from ..auth import get_current_user
-from ..openai_client import analyze_resume
+from ..openai_client import analyze_resume, PROMPT_VERSION
+from ..cache import get_cache, resumes_key, suggestions_key, section_key
+from ..suggestions import render_markdown, render_section_markdown, render_section_html
 import traceback
 
 router = APIRouter()
 
+# How long listings and suggestions are served from the shared cache
+RESUMES_CACHE_TTL = 60
+SUGGESTIONS_CACHE_TTL = 300
+# Rendered sections belong to an immutable suggestions version
+SECTION_CACHE_TTL = 24 * 60 * 60
+
 @router.post("/upload", response_model=Resume)
 async def upload_resume(
     file: UploadFile = File(...),
@@ -53,17 +69,23 @@ async def upload_resume(
             # Analyze resume and get suggestions
             print("Analyzing resume with OpenAI...")
             suggestions = await analyze_resume(content)
+            # Only a successful analysis counts as current for the re-analysis job
+            metadata = {"prompt_version": PROMPT_VERSION}
             print("Resume analysis complete")
         except Exception as e:
             print(f"OpenAI analysis error: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             # Don't fail the upload if analysis fails
-            suggestions = ""
+            suggestions = StructuredSuggestions()
+            metadata = {"analysis_failed": "true"}
         
         try:
             # Upload suggestions to Firebase Storage
             print("Uploading suggestions...")
-            suggestions_path = await storage.upload_suggestions(suggestions, resume_id, current_user.id)
+            suggestions_path = await storage.upload_suggestions(
+                suggestions, resume_id, current_user.id,
+                metadata=metadata
+            )
             resume.suggestionsPath = suggestions_path
             print("Suggestions uploaded successfully")
         except Exception as e:
@@ -88,6 +110,44 @@ async def upload_resume(
             }
         )
 
+async def load_suggestions(
+    user_id: str,
+    resume_id: str,
+    storage: FirebaseStorage
+) -> tuple[str, datetime, StructuredSuggestions, Optional[str]]:
+    """
+    Get the latest suggestions version for a resume, from the shared cache if possible.
+    Returns a tuple of (path, created_at, suggestions, markdown), where markdown
+    is the stored text of versions written before suggestions were structured.
+    """
+    cache = get_cache()
+    cached = await cache.aget(suggestions_key(user_id, resume_id))
+    if isinstance(cached, dict):
+        return (
+            cached["path"],
+            datetime.fromisoformat(cached["created_at"]),
+            StructuredSuggestions.model_validate(cached["suggestions"]),
+            cached.get("markdown")
+        )
+    
+    latest = await storage.get_latest_suggestions(user_id, resume_id)
+    if latest is None:
+        print(f"No suggestions found for resume {resume_id}")
+        raise HTTPException(status_code=404, detail="Suggestions not found")
+    
+    path, created_at, suggestions, markdown = latest
+    await cache.aset(
+        suggestions_key(user_id, resume_id),
+        {
+            "path": path,
+            "created_at": created_at.isoformat(),
+            "suggestions": suggestions.model_dump(mode="json", exclude_none=True),
+            "markdown": markdown
+        },
+        SUGGESTIONS_CACHE_TTL
+    )
+    return latest
+
 @router.get("/{resume_id}/suggestions", response_model=SuggestionResponse)
 async def get_suggestions(
     resume_id: str,
@@ -95,51 +155,123 @@ async def get_suggestions(
     storage: FirebaseStorage = Depends(get_storage)
 ):
     """
-    Get improvement suggestions for a specific resume.
+    Get improvement suggestions for a specific resume as one markdown document.
     """
     try:
         print(f"Fetching suggestions for resume {resume_id}")
+        _, created_at, suggestions, markdown = await load_suggestions(current_user.id, resume_id, storage)
         
-        # List all blobs in the suggestions directory for this user and resume
-        print(f"Listing blobs in suggestions/{current_user.id}/{resume_id}/")
-        blobs = list(storage.bucket.list_blobs(prefix=f"suggestions/{current_user.id}/{resume_id}/"))
+        return SuggestionResponse(
+            resumeId=resume_id,
+            # Older versions keep their original formatting
+            suggestions=markdown if markdown is not None else render_markdown(suggestions),
+            createdAt=created_at
+        )
         
-        if not blobs:
-            print(f"No suggestions found for resume {resume_id}")
-            raise HTTPException(status_code=404, detail="Suggestions not found")
+    except HTTPException as he:
+        raise
+    except Exception as e:
+        print(f"Error in get_suggestions: {str(e)}")
+        print(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch suggestions: {str(e)}"
+        )
+
+@router.get("/{resume_id}/suggestions/summary", response_model=SuggestionSummaryResponse)
+async def get_suggestions_summary(
+    resume_id: str,
+    current_user: User = Depends(get_current_user),
+    storage: FirebaseStorage = Depends(get_storage)
+):
+    """
+    Get the overall score, summary and section list of a resume's suggestions,
+    without the section items.
+    """
+    try:
+        _, created_at, suggestions, _ = await load_suggestions(current_user.id, resume_id, storage)
         
-        # Sort blobs by name (which includes timestamp) to get the latest
-        blobs.sort(key=lambda b: b.name, reverse=True)
-        blob = blobs[0]
-        print(f"Found suggestion at: {blob.name}")
-            
-        # Read and parse suggestions
-        try:
-            suggestions_str = blob.download_as_string().decode('utf-8')
-            
-            return SuggestionResponse(
-                resumeId=resume_id,
-                suggestions=suggestions_str,
-                createdAt=datetime.now(timezone.utc)
-            )
-        except Exception as e:
-            print(f"Error reading suggestions: {str(e)}")
-            print(f"Traceback: {traceback.format_exc()}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to read suggestions: {str(e)}"
-            )
+        return SuggestionSummaryResponse(
+            resumeId=resume_id,
+            overallScore=suggestions.overallScore,
+            summary=suggestions.summary,
+            sections=[
+                SectionSummary(
+                    id=section.id,
+                    title=section.title,
+                    score=section.score,
+                    itemCount=len(section.items)
+                )
+                for section in suggestions.sections
+            ],
+            createdAt=created_at
+        )
         
     except HTTPException as he:
         raise
     except Exception as e:
-        print(f"Error in get_suggestions: {str(e)}")
+        print(f"Error in get_suggestions_summary: {str(e)}")
         print(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch suggestions: {str(e)}"
         )
 
+@router.get(
+    "/{resume_id}/suggestions/sections/{section_id}",
+    response_model=SuggestionSectionResponse,
+    response_model_exclude_none=True
+)
+async def get_suggestions_section(
+    resume_id: str,
+    section_id: str,
+    format: Literal["json", "markdown", "html"] = Query("json"),
+    current_user: User = Depends(get_current_user),
+    storage: FirebaseStorage = Depends(get_storage)
+):
+    """
+    Get one section of a resume's suggestions, either as structured items
+    (format=json) or pre-rendered as markdown or HTML.
+    """
+    try:
+        path, created_at, suggestions, _ = await load_suggestions(current_user.id, resume_id, storage)
+        section = next((s for s in suggestions.sections if s.id == section_id), None)
+        if section is None:
+            raise HTTPException(status_code=404, detail="Section not found")
+        
+        items = None
+        content = None
+        if format == "json":
+            items = section.items
+        else:
+            cache = get_cache()
+            content = await cache.aget(section_key(path, section_id, format))
+            if content is None:
+                render = render_section_html if format == "html" else render_section_markdown
+                content = render(section)
+                await cache.aset(section_key(path, section_id, format), content, SECTION_CACHE_TTL)
+        
+        return SuggestionSectionResponse(
+            resumeId=resume_id,
+            id=section.id,
+            title=section.title,
+            score=section.score,
+            format=format,
+            items=items,
+            content=content,
+            createdAt=created_at
+        )
+        
+    except HTTPException as he:
+        raise
+    except Exception as e:
+        print(f"Error in get_suggestions_section: {str(e)}")
+        print(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch suggestions section: {str(e)}"
+        )
+
 @router.get("/user/{user_id}", response_model=List[Resume])
 async def get_user_resumes(
     user_id: str,
@@ -154,6 +286,11 @@ async def get_user_resumes(
         raise HTTPException(status_code=403, detail="Not authorized to access these resumes")
         
     try:
+        cache = get_cache()
+        cached_resumes = await cache.aget(resumes_key(user_id))
+        if cached_resumes is not None:
+            return [Resume(**resume) for resume in cached_resumes]
+        
         # List all resumes in the user's directory
         print(f"Listing resumes for user {user_id}")
         blobs = storage.bucket.list_blobs(prefix=f"resumes/{user_id}/")
@@ -188,6 +325,11 @@ async def get_user_resumes(
             resumes.append(resume)
             
         print(f"Returning {len(resumes)} resumes")
+        await cache.aset(
+            resumes_key(user_id),
+            [resume.model_dump(mode="json") for resume in resumes],
+            RESUMES_CACHE_TTL
+        )
         return resumes
         
     except Exception as e:
@@ -0,0 +1,52 @@
+"""
+Multi-process server entry point.
+
+Runs uvicorn with one worker per CPU core (or WEB_CONCURRENCY). uvicorn
+starts workers with the spawn method, so each one imports the app fresh and
+creates its own Firebase, storage and OpenAI clients in the lifespan hook.
+The os.register_at_fork hooks in cache.py, storage.py and openai_client.py
+are not needed here; they only matter under a server that forks after
+importing the app, such as gunicorn --preload. Workers share hot data
+through the SQLite cache in cache.py.
+
+On shutdown, workers stop accepting connections and wait up to
+SHUTDOWN_TIMEOUT seconds for in-flight requests, such as running analyses,
+to finish.
+
+Run from the project root:
+
+    python -m server.app.serve --host 0.0.0.0 --port 5000
+"""
+import argparse
+import os
+import uvicorn
+from .config import get_settings
+
+APP = f"{__package__}.main:app"
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY if set, otherwise the number of usable CPU cores"""
+    settings = get_settings()
+    if settings.web_concurrency:
+        return settings.web_concurrency
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "5000")))
+    parser.add_argument("--workers", type=int, help="worker processes (default: WEB_CONCURRENCY or CPU cores)")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=args.workers or worker_count(),
+        timeout_graceful_shutdown=get_settings().shutdown_timeout,
+    )
+
+if __name__ == "__main__":
+    main()
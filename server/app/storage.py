@@ -1,10 +1,17 @@
 from firebase_admin import storage
 from datetime import datetime, timezone, timedelta
+import asyncio
+import os
 import uuid
 from typing import Optional
 import json
 import traceback
-from .config import STORAGE_BUCKET
+from .config import get_settings
+from .firebase import initialize_firebase
+from .cache import get_cache, resumes_key, suggestions_key
+from .models import StructuredSuggestions
+from .suggestions import parse_markdown
+from pydantic import ValidationError
 
 class FirebaseStorage:
     _instance: Optional['FirebaseStorage'] = None
@@ -18,10 +25,10 @@ class FirebaseStorage:
     def __init__(self):
         if not self._initialized:
             try:
-                self.bucket = storage.bucket(name=STORAGE_BUCKET)
+                initialize_firebase()
+                self.bucket = storage.bucket(name=get_settings().storage_bucket)
                 if not self.bucket:
                     raise ValueError("Failed to get storage bucket")
-                print(f"Successfully initialized Firebase Storage bucket: {self.bucket.name}")
                 self._initialized = True
             except Exception as e:
                 print(f"Error initializing Firebase Storage: {str(e)}")
@@ -65,15 +72,24 @@ class FirebaseStorage:
             if not url:
                 raise ValueError("Failed to generate URL for uploaded file")
                 
+            # The user's resume list changed in every worker
+            await get_cache().adelete(resumes_key(user_id))
             return url, resume_id
         except Exception as e:
             print(f"Error in upload_pdf: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             raise
 
-    async def upload_suggestions(self, suggestions: str, resume_id: str, user_id: str) -> str:
+    async def upload_suggestions(
+        self,
+        suggestions: StructuredSuggestions,
+        resume_id: str,
+        user_id: str,
+        metadata: Optional[dict] = None
+    ) -> str:
         """
         Upload resume improvement suggestions to Firebase Storage.
+        Each upload is a new version; readers pick the most recently created one.
         Returns the path to the suggestions document.
         """
         try:
@@ -82,12 +98,16 @@ class FirebaseStorage:
             filename = f"suggestions/{user_id}/{resume_id}/{suggestions_id}"
             print(f"Uploading suggestions to {filename}")
             blob = self.bucket.blob(filename)
+            if metadata:
+                blob.metadata = metadata
             
-            # Upload suggestions as plain text
-            blob.upload_from_string(
-                suggestions,
-                content_type='text/markdown'
+            # Upload suggestions as compact JSON
+            await asyncio.to_thread(
+                blob.upload_from_string,
+                suggestions.model_dump_json(exclude_none=True),
+                content_type='application/json'
             )
+            await get_cache().adelete(suggestions_key(user_id, resume_id))
             
             return filename
         except Exception as e:
@@ -95,23 +115,93 @@ class FirebaseStorage:
             print(f"Traceback: {traceback.format_exc()}")
             raise
 
-    async def get_suggestions(self, suggestions_path: str) -> str:
+    async def get_suggestions(self, suggestions_path: str) -> tuple[StructuredSuggestions, Optional[str]]:
         """
         Get resume improvement suggestions from Firebase Storage.
-        Returns the suggestions as markdown text.
+        Returns a tuple of (suggestions, markdown). Versions stored before
+        suggestions were structured are parsed from markdown, and their
+        original markdown is returned too; markdown is None for JSON versions.
         """
         try:
             print(f"Getting suggestions from {suggestions_path}")
             blob = self.bucket.blob(suggestions_path)
             
             # Download suggestions as text
-            suggestions = blob.download_as_string().decode('utf-8')
-            return suggestions
+            suggestions = (await asyncio.to_thread(blob.download_as_bytes)).decode('utf-8')
+            try:
+                return StructuredSuggestions.model_validate_json(suggestions), None
+            except ValidationError:
+                return parse_markdown(suggestions), suggestions
         except Exception as e:
             print(f"Error in get_suggestions: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             raise
 
+    async def get_latest_suggestions(
+        self,
+        user_id: str,
+        resume_id: str
+    ) -> Optional[tuple[str, datetime, StructuredSuggestions, Optional[str]]]:
+        """
+        Get the most recent suggestions version for a resume.
+        Returns a tuple of (path, created_at, suggestions, markdown), where
+        markdown is the stored text of pre-structured versions and None otherwise,
+        or None if there are no suggestions.
+        """
+        blob = await self._latest_suggestions_blob(user_id, resume_id)
+        if blob is None:
+            return None
+        print(f"Found suggestion at: {blob.name}")
+        suggestions, markdown = await self.get_suggestions(blob.name)
+        return blob.name, blob.time_created, suggestions, markdown
+
+    async def get_latest_prompt_version(self, user_id: str, resume_id: str) -> Optional[str]:
+        """
+        Get the prompt version recorded on the most recent suggestions version,
+        or None if there are no suggestions or they predate version tagging.
+        """
+        blob = await self._latest_suggestions_blob(user_id, resume_id)
+        if blob is None or not blob.metadata:
+            return None
+        return blob.metadata.get("prompt_version")
+
+    async def _latest_suggestions_blob(self, user_id: str, resume_id: str):
+        prefix = f"suggestions/{user_id}/{resume_id}/"
+        print(f"Listing blobs in {prefix}")
+        blobs = await asyncio.to_thread(lambda: list(self.bucket.list_blobs(prefix=prefix)))
+        if not blobs:
+            return None
+        
+        # Suggestion names are random ids, so use creation time to get the latest
+        return max(blobs, key=lambda b: b.time_created)
+
+    def list_resume_blobs(self, user_id: Optional[str] = None):
+        """
+        Iterate lazily over stored resume PDFs, optionally for a single user.
+        Pages are fetched from the bucket as the iterator advances.
+        """
+        prefix = f"resumes/{user_id}/" if user_id else "resumes/"
+        return self.bucket.list_blobs(prefix=prefix)
+
+    async def download_pdf(self, blob_name: str) -> bytes:
+        """Download a stored resume PDF without blocking the event loop"""
+        try:
+            blob = self.bucket.blob(blob_name)
+            return await asyncio.to_thread(blob.download_as_bytes)
+        except Exception as e:
+            print(f"Error in download_pdf: {str(e)}")
+            print(f"Traceback: {traceback.format_exc()}")
+            raise
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The bucket's HTTP session belongs to the parent process
+        cls._instance = None
+
 def get_storage() -> FirebaseStorage:
     """Get the FirebaseStorage singleton instance"""
-    return FirebaseStorage() 
\ No newline at end of file
+    return FirebaseStorage()
+
+# Only runs under servers that fork after importing the app, such as
+# gunicorn --preload; serve.py's uvicorn workers are spawned and import fresh
+os.register_at_fork(after_in_child=FirebaseStorage._reset_after_fork) 
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Structured suggestions: parsing analysis output and rendering sections.
+
+Sections and items get ids derived from their content, so the same stored
+result always yields the same ids and clients can fetch sections lazily.
+Results written before suggestions were structured are plain markdown;
+parse_markdown turns them into the same shape.
+"""
+from html import escape
+from typing import Any, Iterable, Optional
+import hashlib
+import json
+import re
+from .models import StructuredSuggestions, SuggestionItem, SuggestionSection
+
+class AnalysisParseError(ValueError):
+    """Analysis output that yields no usable suggestions"""
+
+def _slugify(title: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return slug or "section"
+
+def _item_id(section_id: str, text: str) -> str:
+    return f"{section_id}-{hashlib.sha1(text.encode()).hexdigest()[:8]}"
+
+def _unique(base: str, seen: set) -> str:
+    unique_id = base
+    suffix = 2
+    while unique_id in seen:
+        unique_id = f"{base}-{suffix}"
+        suffix += 1
+    seen.add(unique_id)
+    return unique_id
+
+def build_sections(raw_sections: Iterable[tuple[str, Optional[int], list[str]]]) -> list[SuggestionSection]:
+    """Assign stable ids to (title, score, items) tuples"""
+    sections = []
+    seen_sections = set()
+    for title, score, items in raw_sections:
+        section_id = _unique(_slugify(title), seen_sections)
+        seen_items = set()
+        sections.append(SuggestionSection(
+            id=section_id,
+            title=title,
+            score=score,
+            items=[
+                SuggestionItem(id=_unique(_item_id(section_id, text), seen_items), text=text)
+                for text in items
+            ]
+        ))
+    return sections
+
+def _load_json(text: str) -> Optional[Any]:
+    """
+    Parse JSON, recovering output that was cut off at max_tokens by closing
+    the open brackets after the last complete value. Returns None if the
+    text is not JSON.
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        if not text.startswith(("{", "[")):
+            return None
+
+    closers = []
+    cuts = []
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if closers:
+                closers.pop()
+            cuts.append((i + 1, "".join(reversed(closers))))
+        elif ch == ",":
+            cuts.append((i, "".join(reversed(closers))))
+
+    for end, closing in reversed(cuts):
+        try:
+            return json.loads(text[:end] + closing)
+        except ValueError:
+            continue
+    return None
+
+def _score(value: Any) -> Optional[int]:
+    """Round a model-provided score into 0-10, or None if it is not one"""
+    if isinstance(value, bool):
+        return None
+    try:
+        score = round(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return score if 0 <= score <= 10 else None
+
+def _raw_section(section: Any) -> Optional[tuple[str, Optional[int], list[str]]]:
+    """Validate one section of the analysis JSON, or None to skip it"""
+    if not isinstance(section, dict):
+        return None
+    title = section.get("title")
+    items = section.get("items", [])
+    if not isinstance(title, str) or not title.strip() or not isinstance(items, list):
+        return None
+    texts = [
+        str(item).strip() for item in items
+        if isinstance(item, (str, int, float)) and not isinstance(item, bool) and str(item).strip()
+    ]
+    return title.strip(), _score(section.get("score")), texts
+
+def parse_analysis(content: str) -> StructuredSuggestions:
+    """
+    Parse the JSON produced by the analysis prompt.
+    Invalid scores are dropped and invalid sections skipped; only output
+    that is not JSON at all is parsed as markdown. Raises AnalysisParseError
+    if the output is unrecoverable or has no sections, so callers never
+    store an empty result as a new version.
+    """
+    # Models sometimes wrap JSON in a ```json fence
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", content.strip())
+    data = _load_json(text)
+    if data is None:
+        if text.startswith(("{", "[")):
+            raise AnalysisParseError("Analysis JSON could not be recovered")
+        print("Analysis is not JSON, parsing as markdown")
+        suggestions = parse_markdown(content)
+    else:
+        if isinstance(data, list):
+            data = {"sections": data}
+        if not isinstance(data, dict):
+            raise AnalysisParseError("Analysis JSON is not an object")
+
+        raw_sections = data.get("sections")
+        summary = data.get("summary")
+        suggestions = StructuredSuggestions(
+            overallScore=_score(data.get("overall_score")),
+            summary=summary.strip() if isinstance(summary, str) else "",
+            sections=build_sections(
+                raw for raw in map(_raw_section, raw_sections if isinstance(raw_sections, list) else [])
+                if raw is not None
+            )
+        )
+
+    if not suggestions.sections:
+        raise AnalysisParseError("Analysis has no suggestion sections")
+    return suggestions
+
+def parse_markdown(markdown: str) -> StructuredSuggestions:
+    """Split free-form markdown into sections at headings and items at bullets"""
+    summary_lines = []
+    raw_sections: list[tuple[str, Optional[int], list[str]]] = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        heading = re.match(r"^#{1,6}\s+(.*)", stripped)
+        bullet = re.match(r"^(?:[-*+]|\d+[.)])\s+(.*)", stripped)
+        if heading:
+            raw_sections.append((heading.group(1).strip(), None, []))
+        elif raw_sections and bullet:
+            raw_sections[-1][2].append(bullet.group(1).strip())
+        elif raw_sections and raw_sections[-1][2]:
+            # Continuation of the previous bullet
+            raw_sections[-1][2][-1] += f" {stripped}"
+        elif raw_sections:
+            raw_sections[-1][2].append(stripped)
+        else:
+            summary_lines.append(stripped)
+    return StructuredSuggestions(summary=" ".join(summary_lines), sections=build_sections(raw_sections))
+
+def render_section_markdown(section: SuggestionSection) -> str:
+    title = section.title if section.score is None else f"{section.title} ({section.score}/10)"
+    lines = [f"## {title}", ""]
+    lines.extend(f"- {item.text}" for item in section.items)
+    return "\n".join(lines) + "\n"
+
+def render_section_html(section: SuggestionSection) -> str:
+    score = "" if section.score is None else f' <span class="score">{section.score}/10</span>'
+    items = "".join(f'<li id="{escape(item.id)}">{escape(item.text)}</li>' for item in section.items)
+    return f'<section id="{escape(section.id)}"><h2>{escape(section.title)}{score}</h2><ul>{items}</ul></section>'
+
+def render_markdown(suggestions: StructuredSuggestions) -> str:
+    """Render the whole result as one markdown document"""
+    parts = []
+    if suggestions.overallScore is not None:
+        parts.append(f"**Overall score: {suggestions.overallScore}/10**\n")
+    if suggestions.summary:
+        parts.append(f"{suggestions.summary}\n")
+    parts.extend(render_section_markdown(section) for section in suggestions.sections)
+    return "\n".join(parts)
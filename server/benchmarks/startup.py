@@ -0,0 +1,125 @@
+"""
+Startup-time benchmark for the API server.
+
+Measures, in fresh interpreter processes:
+- import: time to import server.app.main
+- first_request: time from spawning uvicorn to the first successful /healthcheck
+
+Run from the project root with the usual .env in place:
+
+    python server/benchmarks/startup.py --runs 5 --output bench_output.txt
+
+Each run appends one JSON line tagged with the current git commit, so results
+can be compared across commits.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.resolve()
+APP = "server.app.main:app"
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import server.app.main
+print(time.perf_counter() - start)
+"""
+
+def measure_import() -> float:
+    """Import the app in a fresh interpreter and return the import time in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_first_request(timeout: float) -> float:
+    """Start uvicorn and return the seconds until /healthcheck first answers 200"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/healthcheck"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", APP, "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Server exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise TimeoutError(f"No response from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "min": round(min(samples), 4),
+        "median": round(statistics.median(samples), 4),
+        "max": round(max(samples), 4),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts per measurement")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for the first request")
+    parser.add_argument("--output", type=Path, help="append the JSON result to this file")
+    args = parser.parse_args()
+
+    import_samples = [measure_import() for _ in range(args.runs)]
+    first_request_samples = [measure_first_request(args.timeout) for _ in range(args.runs)]
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "environment": os.getenv("ENVIRONMENT", "development"),
+        "runs": args.runs,
+        "import": summarize(import_samples),
+        "first_request": summarize(first_request_samples),
+    }
+    line = json.dumps(result)
+    print(line)
+    if args.output:
+        with args.output.open("a") as f:
+            f.write(line + "\n")
+
+if __name__ == "__main__":
+    main()